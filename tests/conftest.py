@@ -1,7 +1,67 @@
+import json
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 # Add the project root to sys.path so 'import travelai' works in tests
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from travelai.nlp import BrochureRetriever  # noqa: E402
+from travelai.qa import BrochureQAPipeline  # noqa: E402
+
+
+SAMPLE_CHUNKS = [
+    ("London Brochure", "The Buckingham Hotel in London is close to the palace."),
+    ("London Brochure", "London hotels range from boutique rooms to grand suites."),
+    ("London Brochure", "Afternoon tea is served daily in many cafes."),
+    ("Dubai Brochure", "The Burj Hotel in Dubai offers luxury hotels on the beach."),
+    ("Dubai Brochure", "Dubai desert safaris depart every morning."),
+    ("New York Brochure", "The Park Hotel in New York has views of Central Park."),
+    ("Las Vegas Brochure", "Casinos and shows on the Strip never close."),
+]
+
+
+@pytest.fixture
+def brochures_jsonl(tmp_path):
+    path = tmp_path / "brochures.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        for chunk_id, (city, text) in enumerate(SAMPLE_CHUNKS):
+            record = {"city": city, "source_file": f"{city}.pdf", "chunk_id": chunk_id, "text": text}
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+@pytest.fixture
+def retriever(brochures_jsonl):
+    retriever = BrochureRetriever(brochures_jsonl)
+    retriever.load()
+    return retriever
+
+
+class StubLLM:
+    """Records prompts and returns a canned answer (no network)."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=f"stub answer {len(self.prompts)}")
+
+
+@pytest.fixture
+def stub_llm():
+    return StubLLM()
+
+
+@pytest.fixture
+def pipeline(retriever, stub_llm):
+    # Bypass __init__, which loads the real dataset and an OpenAI client
+    pipeline = BrochureQAPipeline.__new__(BrochureQAPipeline)
+    pipeline.retriever = retriever
+    pipeline.llm = stub_llm
+    return pipeline
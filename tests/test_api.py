@@ -0,0 +1,67 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from travelai.api import main
+
+
+client = TestClient(main.app)
+
+FULL_FIELDS = {"city", "source_file", "chunk_id", "text", "score"}
+
+
+@pytest.fixture(autouse=True)
+def offline_backend(monkeypatch, retriever, pipeline):
+    monkeypatch.setattr(main, "get_retriever", lambda: retriever)
+    monkeypatch.setattr(main, "get_qa_pipeline", lambda: pipeline)
+
+
+def test_search_default_response_is_unchanged():
+    resp = client.post("/search", json={"query": "hotels in London", "k": 3})
+    assert resp.status_code == 200
+    results = resp.json()
+    assert len(results) == 3
+    assert all(set(r) == FULL_FIELDS for r in results)
+
+
+def test_search_snippet_mode_replaces_text():
+    resp = client.post("/search", json={"query": "hotels in London", "k": 3, "snippet_len": 30})
+    assert resp.status_code == 200
+    for r in resp.json():
+        assert set(r) == {"city", "source_file", "chunk_id", "score", "snippet", "highlights"}
+        for start, end in r["highlights"]:
+            assert r["snippet"][start:end].lower() in {"hotels", "london"}
+
+
+def test_search_field_selection():
+    resp = client.post("/search", json={"query": "hotels", "fields": ["city", "snippet"]})
+    assert resp.status_code == 200
+    assert all(set(r) == {"city", "snippet"} for r in resp.json())
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [{"fields": []}, {"fields": ["nope"]}, {"snippet_len": 5}],
+)
+def test_search_rejects_invalid_parameters(extra):
+    resp = client.post("/search", json={"query": "hotels", **extra})
+    assert resp.status_code == 422
+
+
+def test_qa_default_response_is_unchanged():
+    resp = client.post("/qa", json={"question": "Which hotel in London is close to the palace?"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert set(data) == {"answer", "context"}
+    assert data["context"]
+    assert all(set(c) == FULL_FIELDS for c in data["context"])
+
+
+def test_qa_field_selection():
+    resp = client.post(
+        "/qa",
+        json={"question": "Compare hotels in London and Dubai", "fields": ["city", "highlights"], "k": 2},
+    )
+    assert resp.status_code == 200
+    context = resp.json()["context"]
+    assert {c["city"] for c in context} == {"London Brochure", "Dubai Brochure"}
+    assert all(set(c) == {"city", "highlights"} for c in context)
@@ -0,0 +1,84 @@
+import pytest
+
+from travelai.qa.rag import NO_ANSWER
+
+
+def test_detect_cities_in_question_order(pipeline):
+    question = "Compare Dubai, new york and London hotels"
+    assert pipeline._detect_cities_from_question(question) == [
+        "Dubai Brochure",
+        "New York Brochure",
+        "London Brochure",
+    ]
+    assert pipeline._detect_city_from_question(question) == "Dubai Brochure"
+
+
+def test_detect_cities_without_mention(pipeline):
+    assert pipeline._detect_cities_from_question("Where can I stay?") == []
+    assert pipeline._detect_city_from_question("Where can I stay?") is None
+
+
+@pytest.mark.parametrize("k", [2, 3, 5])
+def test_retrieve_multi_city_respects_k(pipeline, k):
+    chunks = pipeline.retrieve("Compare hotels in London and Dubai", k=k)
+    cities = [c.city for c in chunks]
+    assert len(chunks) <= k
+    assert {"London Brochure", "Dubai Brochure"} == set(cities)
+    # Grouped by city, in question order
+    assert cities == sorted(cities, key=["London Brochure", "Dubai Brochure"].index)
+
+
+@pytest.mark.parametrize(
+    "question, k",
+    [
+        ("Compare hotels in London and Dubai", 1),
+        ("Compare hotels in London, Dubai and New York", 2),
+    ],
+)
+def test_answer_comparison_k_below_city_count_answers_every_city(pipeline, stub_llm, question, k):
+    cities = pipeline._detect_cities_from_question(question)
+    result = pipeline.answer(question, k=k)
+
+    # One chunk per city, even though that exceeds k
+    assert [c["city"] for c in result["context"]] == cities
+
+    # One sub-answer per city + one merge call; no city reported as missing
+    assert len(stub_llm.prompts) == len(cities) + 1
+    assert NO_ANSWER not in stub_llm.prompts[-1]
+
+
+def test_answer_single_city_uses_one_llm_call(pipeline, stub_llm):
+    result = pipeline.answer("Which hotel in London is close to the palace?", k=2)
+    assert len(stub_llm.prompts) == 1
+    assert {c["city"] for c in result["context"]} == {"London Brochure"}
+
+
+def test_answer_comparison_merges_one_sub_answer_per_city(pipeline, stub_llm):
+    result = pipeline.answer("Compare hotels in London and Dubai", k=4)
+
+    assert len(result["context"]) <= 4
+    assert {c["city"] for c in result["context"]} == {"London Brochure", "Dubai Brochure"}
+
+    # Two sub-answers + one merge call
+    assert len(stub_llm.prompts) == 3
+    merge_prompt = stub_llm.prompts[-1]
+    assert "### Per-city Answers" in merge_prompt
+    assert merge_prompt.count("[London Brochure]") == 1
+    assert merge_prompt.count("[Dubai Brochure]") == 1
+    assert result["answer"] == "stub answer 3"
+
+
+def test_answer_comparison_skips_city_without_matches(pipeline, stub_llm):
+    result = pipeline.answer("Compare hotels in London and Las Vegas", k=4)
+
+    assert {c["city"] for c in result["context"]} == {"London Brochure"}
+    # One sub-answer (London) + one merge call
+    assert len(stub_llm.prompts) == 2
+    assert f"[Las Vegas Brochure]\n{NO_ANSWER}" in stub_llm.prompts[-1]
+
+
+def test_answer_comparison_without_any_match_skips_llm(pipeline, stub_llm):
+    result = pipeline.answer("Compare golf in Las Vegas and San Francisco", k=4)
+
+    assert result == {"answer": NO_ANSWER, "context": []}
+    assert stub_llm.prompts == []
@@ -0,0 +1,28 @@
+def test_search_without_city_returns_top_k(retriever):
+    chunks = retriever.search("hotels", k=3)
+    assert len(chunks) == 3
+    assert chunks == sorted(chunks, key=lambda c: c.score, reverse=True)
+
+
+def test_search_with_city_keeps_only_matching_chunks(retriever):
+    chunks = retriever.search("hotels in London", k=10, city="London Brochure")
+    assert chunks
+    assert all(c.city == "London Brochure" for c in chunks)
+    assert all(c.score > 0 for c in chunks)
+    # The afternoon tea chunk shares no term with the query
+    assert all("tea" not in c.text for c in chunks)
+
+
+def test_search_with_city_without_matches_is_empty(retriever):
+    assert retriever.search("hotels", k=5, city="Las Vegas Brochure") == []
+
+
+def test_search_by_city_splits_one_ranking(retriever):
+    results = retriever.search_by_city("hotels", ["London Brochure", "Dubai Brochure"], k=1)
+    assert set(results) == {"London Brochure", "Dubai Brochure"}
+    assert [c.city for c in results["London Brochure"]] == ["London Brochure"]
+    assert [c.city for c in results["Dubai Brochure"]] == ["Dubai Brochure"]
+
+
+def test_query_terms_keeps_vocabulary_order(retriever):
+    assert retriever.query_terms("Hotels in London, hotels and zzz") == ["hotels", "london"]
@@ -0,0 +1,81 @@
+import pytest
+
+from travelai.nlp import make_snippet
+from travelai.nlp.snippets import ELLIPSIS
+
+
+TEXT = (
+    "Margie's Travel offers trips to many cities. " * 4
+    + "The Park Hotel in New York has views of Central Park and is close to Broadway. "
+    + "Other filler text about nothing in particular. " * 4
+)
+TERMS = ["park", "hotel", "central", "views"]
+
+
+def assert_highlights_are_terms(snippet, terms):
+    for start, end in snippet.highlights:
+        assert snippet.text[start:end].lower() in terms
+
+
+def test_short_text_is_returned_whole():
+    snippet = make_snippet("A park hotel.", TERMS, snippet_len=50)
+    assert snippet.text == "A park hotel."
+    assert snippet.highlights == [(2, 6), (7, 12)]
+
+
+@pytest.mark.parametrize("snippet_len", [20, 40, 80, 120, 200])
+def test_window_covers_best_matches(snippet_len):
+    snippet = make_snippet(TEXT, TERMS, snippet_len=snippet_len)
+
+    assert snippet.text.startswith(ELLIPSIS) and snippet.text.endswith(ELLIPSIS)
+    assert len(snippet.text) <= snippet_len + 2 * len(ELLIPSIS)
+    assert snippet.highlights
+    assert_highlights_are_terms(snippet, TERMS)
+
+
+def test_window_snaps_to_word_boundaries():
+    snippet = make_snippet(TEXT, TERMS, snippet_len=80)
+    body = snippet.text[len(ELLIPSIS):-len(ELLIPSIS)]
+    assert f" {body} " in f" {TEXT} "
+
+
+def test_window_prefers_distinct_terms():
+    text = "park " * 30 + "filler " * 20 + "central hotel views " + "filler " * 20
+    snippet = make_snippet(text, TERMS, snippet_len=40)
+    assert "central hotel views" in snippet.text
+
+
+@pytest.mark.parametrize("snippet_len", [1, 3, 5])
+def test_anchor_match_is_never_cut(snippet_len):
+    snippet = make_snippet("We like the best hotels in town", ["hotels"], snippet_len=snippet_len)
+    assert "hotels" in snippet.text
+    assert len(snippet.highlights) == 1
+    assert_highlights_are_terms(snippet, ["hotels"])
+
+
+def test_no_match_returns_start_of_text():
+    snippet = make_snippet(TEXT, ["zzz"], snippet_len=50)
+    assert snippet.highlights == []
+    assert not snippet.text.startswith(ELLIPSIS)
+    assert snippet.text.endswith(ELLIPSIS)
+    assert TEXT.startswith(snippet.text[: -len(ELLIPSIS)])
+
+
+@pytest.mark.parametrize("snippet_len", [20, 30, 45])
+def test_window_snaps_on_newlines_and_collapses_whitespace(snippet_len):
+    text = "alpha\nbeta\ngamma\ndelta\nhotels\nepsilon\nzeta\neta\ntheta\niota"
+    snippet = make_snippet(text, ["hotels"], snippet_len=snippet_len)
+
+    body = snippet.text.strip(".")
+    assert "\n" not in snippet.text
+    assert body == body.strip()
+    # Only whole words from the text
+    assert set(body.split(" ")) <= set(text.split("\n"))
+    assert "hotels" in body.split(" ")
+    assert_highlights_are_terms(snippet, ["hotels"])
+
+
+def test_short_text_whitespace_is_collapsed():
+    snippet = make_snippet("  A park\n\nhotel. ", TERMS, snippet_len=50)
+    assert snippet.text == "A park hotel."
+    assert snippet.highlights == [(2, 6), (7, 12)]
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
 
 from langchain.tools import BaseTool
 from pydantic.v1 import PrivateAttr
 
+from travelai.nlp import DEFAULT_SNIPPET_LEN, make_snippet
 from travelai.qa import BrochureQAPipeline
 
 
@@ -12,6 +13,9 @@ class BrochureSearchTool(BaseTool):
     """
     Tool that searches the travel brochures for relevant chunks of text.
     Uses the same retrieval logic as the QA pipeline (filtering + reranking).
+    Observations contain compact snippets around the matched query terms
+    instead of full chunk texts, to keep the agent prompt small.
+    Set `snippet_len=None` to return full texts.
     """
 
     name: str = "brochure_search"
@@ -21,6 +25,8 @@ class BrochureSearchTool(BaseTool):
         "attractions, or descriptions from the brochures."
     )
 
+    snippet_len: Optional[int] = DEFAULT_SNIPPET_LEN
+
     _pipeline: BrochureQAPipeline = PrivateAttr()
 
     def __init__(self, **data: Any) -> None:
@@ -32,11 +38,14 @@ class BrochureSearchTool(BaseTool):
         if not chunks:
             return "No relevant brochure text found."
 
+        terms = self._pipeline.retriever.query_terms(query) if self.snippet_len else []
+
         blocks = []
         for idx, c in enumerate(chunks, start=1):
+            text = make_snippet(c.text, terms, self.snippet_len).text if self.snippet_len else c.text
             block = (
                 f"[{idx}] City: {c.city} | Source: {c.source_file} | Chunk ID: {c.chunk_id} | Score: {c.score:.3f}\n"
-                f"{c.text}"
+                f"{text}"
             )
             blocks.append(block)
 
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Optional, List
+from typing import Optional, List, Literal, Tuple
 
 from fastapi import FastAPI
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pathlib import Path
 
 from fastapi.staticfiles import StaticFiles
@@ -16,27 +16,52 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from travelai.config import BROCHURES_JSONL
-from travelai.nlp import BrochureRetriever
+from travelai.nlp import BrochureRetriever, RetrievedChunk, DEFAULT_SNIPPET_LEN, MIN_SNIPPET_LEN, make_snippet
 from travelai.qa import BrochureQAPipeline
 from travelai.agent import build_travel_agent
 
 
+ResultField = Literal["city", "source_file", "chunk_id", "text", "score", "snippet", "highlights"]
+
+# Fields returned when `snippet_len` is set and `fields` is not:
+# the snippet replaces the full chunk text.
+SNIPPET_FIELDS: List[ResultField] = ["city", "source_file", "chunk_id", "score", "snippet", "highlights"]
+FULL_FIELDS: List[ResultField] = ["city", "source_file", "chunk_id", "text", "score"]
+
+
 class SearchRequest(BaseModel):
     query: str
     k: Optional[int] = 5
+    # Fields to include in each result (default: full chunk, or snippet mode if snippet_len is set)
+    fields: Optional[List[ResultField]] = Field(default=None, min_length=1)
+    # Max snippet length in characters; enables snippet mode
+    snippet_len: Optional[int] = Field(default=None, ge=MIN_SNIPPET_LEN)
 
 
 class SearchResult(BaseModel):
-    city: str
-    source_file: str
-    chunk_id: int
-    text: str
-    score: float
+    """
+    One retrieved chunk.
+    All fields are optional in the schema because `fields=` / `snippet_len=`
+    select which ones are returned; fields that are not returned are omitted
+    (never null). Default requests return city, source_file, chunk_id,
+    text and score, as before.
+    """
+
+    city: Optional[str] = None
+    source_file: Optional[str] = None
+    chunk_id: Optional[int] = None
+    text: Optional[str] = None
+    score: Optional[float] = None
+    snippet: Optional[str] = None
+    # (start, end) offsets of matched query terms inside `snippet`
+    highlights: Optional[List[Tuple[int, int]]] = None
 
 
 class QARequest(BaseModel):
     question: str
     k: Optional[int] = 5
+    fields: Optional[List[ResultField]] = Field(default=None, min_length=1)
+    snippet_len: Optional[int] = Field(default=None, ge=MIN_SNIPPET_LEN)
 
 
 class QAResponse(BaseModel):
@@ -92,46 +117,64 @@ def get_travel_agent():
     return build_travel_agent(model_name="gpt-4o-mini")
 
 
+def to_search_results(
+    retriever: BrochureRetriever,
+    chunks: List[RetrievedChunk],
+    query: str,
+    fields: Optional[List[ResultField]] = None,
+    snippet_len: Optional[int] = None,
+) -> List[SearchResult]:
+    """
+    Build the response payload, keeping only the requested fields.
+    Snippets are computed only if 'snippet' or 'highlights' is requested.
+    """
+    if fields is None:
+        fields = SNIPPET_FIELDS if snippet_len else FULL_FIELDS
+    wanted = set(fields)
+    with_snippet = bool(wanted & {"snippet", "highlights"})
+    terms = retriever.query_terms(query) if with_snippet else []
+
+    results: List[SearchResult] = []
+    for c in chunks:
+        values = {
+            "city": c.city,
+            "source_file": c.source_file,
+            "chunk_id": c.chunk_id,
+            "text": c.text,
+            "score": c.score,
+        }
+        if with_snippet:
+            snippet = make_snippet(c.text, terms, snippet_len or DEFAULT_SNIPPET_LEN)
+            values["snippet"] = snippet.text
+            values["highlights"] = snippet.highlights
+        results.append(SearchResult(**{name: values[name] for name in wanted}))
+    return results
+
+
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok"}
 
 
-@app.post("/search", response_model=List[SearchResult])
+@app.post("/search", response_model=List[SearchResult], response_model_exclude_none=True)
 def search(req: SearchRequest) -> List[SearchResult]:
     retriever = get_retriever()
     k = req.k or 5
     chunks = retriever.search(req.query, k=k)
 
-    return [
-        SearchResult(
-            city=c.city,
-            source_file=c.source_file,
-            chunk_id=c.chunk_id,
-            text=c.text,
-            score=c.score,
-        )
-        for c in chunks
-    ]
+    return to_search_results(retriever, chunks, req.query, fields=req.fields, snippet_len=req.snippet_len)
 
 
-@app.post("/qa", response_model=QAResponse)
+@app.post("/qa", response_model=QAResponse, response_model_exclude_none=True)
 def qa(req: QARequest) -> QAResponse:
     pipeline = get_qa_pipeline()
     k = req.k or 5
     result = pipeline.answer(req.question, k=k)
 
-    context_results: List[SearchResult] = []
-    for c in result["context"]:
-        context_results.append(
-            SearchResult(
-                city=c["city"],
-                source_file=c["source_file"],
-                chunk_id=c["chunk_id"],
-                text=c["text"],
-                score=c["score"],
-            )
-        )
+    chunks = [RetrievedChunk(**c) for c in result["context"]]
+    context_results = to_search_results(
+        pipeline.retriever, chunks, req.question, fields=req.fields, snippet_len=req.snippet_len
+    )
 
     return QAResponse(answer=result["answer"], context=context_results)
 
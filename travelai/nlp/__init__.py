@@ -1,3 +1,4 @@
 from .retriever import BrochureRetriever, RetrievedChunk
+from .snippets import DEFAULT_SNIPPET_LEN, MIN_SNIPPET_LEN, Snippet, make_snippet
 
-__all__ = ["BrochureRetriever", "RetrievedChunk"]
+__all__ = ["BrochureRetriever", "RetrievedChunk", "DEFAULT_SNIPPET_LEN", "MIN_SNIPPET_LEN", "Snippet", "make_snippet"]
@@ -45,25 +45,59 @@ class BrochureRetriever:
         self._vectorizer = TfidfVectorizer(stop_words="english")
         self._matrix = self._vectorizer.fit_transform(self._texts)
 
-    def search(self, query: str, k: int = 5) -> List[RetrievedChunk]:
+    def query_terms(self, query: str) -> List[str]:
+        """
+        Tokens of the query that are in the TF-IDF vocabulary
+        (i.e. the terms that actually contribute to the match).
+        """
+        if self._vectorizer is None:
+            raise RuntimeError("Retriever not loaded. Call .load() first.")
+
+        analyzer = self._vectorizer.build_analyzer()
+        vocabulary = self._vectorizer.vocabulary_
+        return [t for t in dict.fromkeys(analyzer(query)) if t in vocabulary]
+
+    def _score(self, query: str):
         if self._vectorizer is None or self._matrix is None:
             raise RuntimeError("Retriever not loaded. Call .load() first.")
 
         query_vec = self._vectorizer.transform([query])
-        scores = cosine_similarity(query_vec, self._matrix)[0]
+        return cosine_similarity(query_vec, self._matrix)[0]
 
+    def _to_chunk(self, idx: int, score: float) -> RetrievedChunk:
+        meta = self._meta[idx]
+        return RetrievedChunk(
+            city=meta["city"],
+            source_file=meta["source_file"],
+            chunk_id=meta["chunk_id"],
+            text=self._texts[idx],
+            score=float(score),
+        )
+
+    def search(self, query: str, k: int = 5, city: str | None = None) -> List[RetrievedChunk]:
+        """
+        Return the top-k chunks for the query.
+        If `city` is given, only matching chunks (score > 0) from that city are returned.
+        """
+        if city is not None:
+            return self.search_by_city(query, [city], k=k)[city]
+
+        scores = self._score(query)
         top_indices = scores.argsort()[::-1][:k]
+        return [self._to_chunk(idx, scores[idx]) for idx in top_indices]
+
+    def search_by_city(self, query: str, cities: List[str], k: int = 5) -> Dict[str, List[RetrievedChunk]]:
+        """
+        Return the top-k matching chunks (score > 0) for each city.
+        The corpus is scored once and the ranking is split by city.
+        """
+        scores = self._score(query)
 
-        results: List[RetrievedChunk] = []
-        for idx in top_indices:
-            meta = self._meta[idx]
-            results.append(
-                RetrievedChunk(
-                    city=meta["city"],
-                    source_file=meta["source_file"],
-                    chunk_id=meta["chunk_id"],
-                    text=self._texts[idx],
-                    score=float(scores[idx]),
-                )
-            )
+        results: Dict[str, List[RetrievedChunk]] = {city: [] for city in cities}
+        for idx in scores.argsort()[::-1]:
+            if scores[idx] <= 0:
+                break
+            bucket = results.get(self._meta[idx]["city"])
+            if bucket is not None and len(bucket) < k:
+                bucket.append(self._to_chunk(idx, scores[idx]))
         return results
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple
+
+# Same token definition as sklearn's TfidfVectorizer default token_pattern,
+# so highlighted terms line up with the retriever's vocabulary.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+WHITESPACE = re.compile(r"\s")
+WORD = re.compile(r"\S+")
+
+DEFAULT_SNIPPET_LEN = 200
+# Shorter windows can't hold a term plus any context around it
+MIN_SNIPPET_LEN = 20
+ELLIPSIS = "..."
+
+
+@dataclass
+class Snippet:
+    text: str
+    # (start, end) character offsets of matched terms, relative to `text`
+    highlights: List[Tuple[int, int]] = field(default_factory=list)
+
+
+def make_snippet(text: str, terms: Iterable[str], snippet_len: int = DEFAULT_SNIPPET_LEN) -> Snippet:
+    """
+    Cut the window of `text` (at most `snippet_len` chars) that contains the
+    most query terms, and return it with the offsets of the matched terms.
+    - `terms` are lowercase tokens (e.g. from BrochureRetriever.query_terms).
+    - Windows are snapped to word boundaries (any whitespace) and marked
+      with '...' when cut; whitespace inside the window is collapsed to
+      single spaces.
+    - The first matched term of the window is never cut, even if it is
+      longer than `snippet_len`.
+    - If no term matches, the start of the text is returned.
+    """
+    terms = set(terms)
+    matches = [m.span() for m in TOKEN_PATTERN.finditer(text) if m.group().lower() in terms]
+
+    if len(text) <= snippet_len:
+        span_start = span_end = 0
+        start, end = 0, len(text)
+    elif not matches:
+        span_start = span_end = 0
+        start, end = 0, snippet_len
+    else:
+        # 1) Pick the match that starts the window covering the most distinct
+        #    terms (ties broken by total number of matches).
+        best_i, best_j, best_key = 0, 1, (0, 0)
+        j = 0
+        for i, (m_start, _) in enumerate(matches):
+            j = max(j, i + 1)
+            while j < len(matches) and matches[j][1] - m_start <= snippet_len:
+                j += 1
+            distinct = len({text[s:e].lower() for s, e in matches[i:j]})
+            key = (distinct, j - i)
+            if key > best_key:
+                best_i, best_j, best_key = i, j, key
+
+        # 2) Center the matched span inside the window.
+        span_start = matches[best_i][0]
+        span_end = matches[best_j - 1][1]
+        slack = max(0, snippet_len - (span_end - span_start))
+        start = max(0, span_start - slack // 2)
+        end = max(min(len(text), start + snippet_len), span_end)
+        start = min(start, max(0, end - snippet_len))
+
+    # 3) Snap to word boundaries without cutting the matched span.
+    if start > 0:
+        space = WHITESPACE.search(text, start, span_start)
+        if space:
+            start = space.end()
+    if end < len(text):
+        spaces = list(WHITESPACE.finditer(text, span_end, end))
+        if spaces:
+            end = spaces[-1].start()
+
+    # 4) Join the words of the window with single spaces, moving the
+    #    highlight offsets along with them.
+    prefix = ELLIPSIS if text[:start].strip() else ""
+    suffix = ELLIPSIS if text[end:].strip() else ""
+    words: List[str] = []
+    highlights: List[Tuple[int, int]] = []
+    pos = len(prefix)
+    for word in WORD.finditer(text, start, end):
+        for s, e in matches:
+            if word.start() <= s and e <= word.end():
+                highlights.append((pos + s - word.start(), pos + e - word.start()))
+        words.append(word.group())
+        pos += len(word.group()) + 1
+
+    return Snippet(text=f"{prefix}{' '.join(words)}{suffix}", highlights=highlights)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 
 from langchain_openai import ChatOpenAI
 
@@ -8,6 +9,18 @@ from travelai.nlp import BrochureRetriever, RetrievedChunk
 from travelai.config import BROCHURES_JSONL
 
 
+# Aliases used in questions → 'city' names used in the dataset.
+CITY_ALIASES: Dict[str, str] = {
+    "new york": "New York Brochure",
+    "london": "London Brochure",
+    "las vegas": "Las Vegas Brochure",
+    "dubai": "Dubai Brochure",
+    "san francisco": "San Francisco Brochure",
+}
+
+NO_ANSWER = "The brochures do not contain information to answer this question."
+
+
 class BrochureQAPipeline:
     """
     RAG-style QA pipeline:
@@ -15,6 +28,8 @@ class BrochureQAPipeline:
     - Adds:
         * City-aware filtering
         * Simple reranking on top of existing similarity scores
+        * Per-city retrieval and parallel answering for multi-city
+          (comparison) questions
     """
 
     def __init__(self, model_name: str = "gpt-4o-mini"):
@@ -24,24 +39,27 @@ class BrochureQAPipeline:
 
     # ---------- Filtering helpers ----------
 
-    def _detect_city_from_question(self, question: str) -> str | None:
+    def _detect_cities_from_question(self, question: str) -> List[str]:
         """
-        Heuristic: detect explicit city mentions in the question text.
+        Heuristic: detect all explicit city mentions in the question text,
+        in the order they appear.
         This uses the same 'city' names you have in your dataset
         (e.g. 'New York Brochure', 'London Brochure', etc.).
         """
         q = question.lower()
-        mapping: Dict[str, str] = {
-            "new york": "New York Brochure",
-            "london": "London Brochure",
-            "las vegas": "Las Vegas Brochure",
-            "dubai": "Dubai Brochure",
-            "san francisco": "San Francisco Brochure",
-        }
-        for alias, city_name in mapping.items():
-            if alias in q:
-                return city_name
-        return None
+        positions: Dict[str, int] = {}
+        for alias, city_name in CITY_ALIASES.items():
+            pos = q.find(alias)
+            if pos != -1 and pos < positions.get(city_name, len(q)):
+                positions[city_name] = pos
+        return sorted(positions, key=positions.__getitem__)
+
+    def _detect_city_from_question(self, question: str) -> str | None:
+        """
+        Heuristic: detect the first explicit city mention in the question text.
+        """
+        cities = self._detect_cities_from_question(question)
+        return cities[0] if cities else None
 
     def _filter_by_city(self, question: str, chunks: List[RetrievedChunk]) -> List[RetrievedChunk]:
         """
@@ -86,11 +104,20 @@ class BrochureQAPipeline:
 
     def retrieve(self, question: str, k: int = 5) -> List[RetrievedChunk]:
         """
+        Single-city question:
         1) Ask the existing retriever for more candidates (e.g. 4 * k).
         2) Filter by city.
         3) Rerank.
         4) Return final top-k.
+
+        Multi-city question: retrieve per city (see _retrieve_per_city)
+        and return at most max(k, n_cities) chunks, grouped by city.
         """
+        cities = self._detect_cities_from_question(question)
+        if len(cities) > 1:
+            per_city = self._retrieve_per_city(question, cities, k=k)
+            return [c for city in cities for c in per_city[city]]
+
         initial_k = max(k * 4, 10)
         # This uses your current similarity model (e.g. TF-IDF)
         candidates = self.retriever.search(question, k=initial_k)
@@ -104,49 +131,144 @@ class BrochureQAPipeline:
         # Final top-k
         return reranked[:k]
 
-    # ---------- LLM answering ----------
+    def _retrieve_per_city(
+        self, question: str, cities: List[str], k: int = 5
+    ) -> Dict[str, List[RetrievedChunk]]:
+        """
+        Split a budget of k chunks across cities:
+        1) Score the corpus once and keep the matching candidates of each city.
+        2) Rerank each city's candidates and keep ceil(k / n_cities).
+        3) Pick round-robin across cities until the budget is used,
+           so every city gets a fair share.
+        The budget is max(k, n_cities): every city with matching chunks gets
+        at least one, so an empty list always means "no match".
+        """
+        per_city_k = max(1, -(-k // len(cities)))  # ceil(k / n_cities)
+        initial_k = max(per_city_k * 4, 10)
+        candidates = self.retriever.search_by_city(question, cities, k=initial_k)
+        ranked = {city: self._rerank(question, candidates[city])[:per_city_k] for city in cities}
 
-    def answer(self, question: str, k: int = 5) -> dict:
-        chunks = self.retrieve(question, k=k)
+        selected: Dict[str, List[RetrievedChunk]] = {city: [] for city in cities}
+        remaining = max(k, len(cities))
+        for rank in range(per_city_k):
+            for city in cities:
+                if remaining and rank < len(ranked[city]):
+                    selected[city].append(ranked[city][rank])
+                    remaining -= 1
+        return selected
+
+    # ---------- Prompt helpers ----------
 
+    def _format_context(self, chunks: List[RetrievedChunk]) -> str:
         if not chunks:
-            context_text = "No context."
+            return "No context."
+
+        context_blocks = []
+        for idx, c in enumerate(chunks):
+            block = (
+                f"[{idx+1}] City: {c.city} | Source: {c.source_file} | Chunk ID: {c.chunk_id}\n"
+                f"{c.text}"
+            )
+            context_blocks.append(block)
+        return "\n\n".join(context_blocks)
+
+    def _build_prompt(self, question: str, chunks: List[RetrievedChunk], city: str | None = None) -> str:
+        """
+        Build the RAG prompt. If `city` is given, the answer is restricted
+        to that city (used for the per-city branches of a comparison).
+        """
+        if city is None:
+            scope = "- Do not mix details from different cities unless the question explicitly asks to compare cities.\n"
         else:
-            context_blocks = []
-            for idx, c in enumerate(chunks):
-                block = (
-                    f"[{idx+1}] City: {c.city} | Source: {c.source_file} | Chunk ID: {c.chunk_id}\n"
-                    f"{c.text}"
-                )
-                context_blocks.append(block)
-            context_text = "\n\n".join(context_blocks)
-
-        prompt = (
+            scope = f"- Answer ONLY for {city}; ignore the other cities mentioned in the question.\n"
+
+        return (
             "You are an AI travel assistant answering questions using ONLY the brochure excerpts given below.\n\n"
             "### Brochure Excerpts (already filtered and reranked)\n"
-            f"{context_text}\n\n"
+            f"{self._format_context(chunks)}\n\n"
             "### Question\n"
             f"{question}\n\n"
             "### Instructions\n"
             "- Use only the excerpts that clearly answer the question.\n"
-            "- Do not mix details from different cities unless the question explicitly asks to compare cities.\n"
-            "- If the brochures do not contain the answer, say: 'The brochures do not contain information to answer this question.'\n"
+            f"{scope}"
+            f"- If the brochures do not contain the answer, say: '{NO_ANSWER}'\n"
             "- Keep the answer short (2–4 sentences).\n\n"
             "### Final Answer:\n"
         )
 
-        response = self.llm.invoke(prompt)
+    def _build_merge_prompt(self, question: str, sub_answers: List[Tuple[str, str]]) -> str:
+        blocks = "\n\n".join(f"[{city}]\n{answer}" for city, answer in sub_answers)
+        return (
+            "You are an AI travel assistant. Below are short answers to the same question, "
+            "each based ONLY on the brochure of one city.\n\n"
+            "### Per-city Answers\n"
+            f"{blocks}\n\n"
+            "### Question\n"
+            f"{question}\n\n"
+            "### Instructions\n"
+            "- Combine the per-city answers into a single comparison.\n"
+            "- Use only facts stated in the per-city answers; do not add new details.\n"
+            "- If a city has no information, say so for that city.\n"
+            "- Keep the answer short (3–6 sentences).\n\n"
+            "### Final Answer:\n"
+        )
+
+    @staticmethod
+    def _context_payload(chunks: List[RetrievedChunk]) -> List[dict]:
+        return [
+            {
+                "city": c.city,
+                "source_file": c.source_file,
+                "chunk_id": c.chunk_id,
+                "text": c.text,
+                "score": c.score,
+            }
+            for c in chunks
+        ]
+
+    # ---------- LLM answering ----------
+
+    def answer(self, question: str, k: int = 5) -> dict:
+        cities = self._detect_cities_from_question(question)
+        if len(cities) > 1:
+            return self._answer_comparison(question, cities, k=k)
+
+        chunks = self.retrieve(question, k=k)
+        response = self.llm.invoke(self._build_prompt(question, chunks))
 
         return {
             "answer": response.content,
-            "context": [
-                {
-                    "city": c.city,
-                    "source_file": c.source_file,
-                    "chunk_id": c.chunk_id,
-                    "text": c.text,
-                    "score": c.score,
-                }
-                for c in chunks
-            ],
+            "context": self._context_payload(chunks),
+        }
+
+    def _answer_comparison(self, question: str, cities: List[str], k: int = 5) -> dict:
+        """
+        Fan-out answering for multi-city questions:
+        1) Retrieve per city (same k budget as retrieve()).
+        2) Generate the per-city sub-answers in parallel LLM calls;
+           cities without matching chunks get NO_ANSWER without a call.
+        3) Merge the sub-answers into one comparison with a final LLM call
+           (skipped if no city has an answer).
+        Latency is roughly the slowest sub-answer plus the merge call.
+        """
+        per_city = self._retrieve_per_city(question, cities, k=k)
+        chunks = [c for city in cities for c in per_city[city]]
+
+        def sub_answer(city: str) -> str:
+            if not per_city[city]:
+                return NO_ANSWER
+            response = self.llm.invoke(self._build_prompt(question, per_city[city], city=city))
+            return response.content
+
+        with ThreadPoolExecutor(max_workers=len(cities)) as pool:
+            sub_answers = list(zip(cities, pool.map(sub_answer, cities)))
+
+        if all(answer == NO_ANSWER for _, answer in sub_answers):
+            answer = NO_ANSWER
+        else:
+            answer = self.llm.invoke(self._build_merge_prompt(question, sub_answers)).content
+
+        return {
+            "answer": answer,
+            "context": self._context_payload(chunks),
         }